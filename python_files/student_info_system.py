@@ -1,21 +1,55 @@
+import argparse
+import atexit
+import bisect
 import json
+import mmap
 import os
-from datetime import datetime
+import pickle
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+    _loads = json.loads
+
+LOG_FLUSH_BYTES = 64 * 1024
+LOG_FLUSH_ENTRIES = 256
+
+_match_age = re.compile(r'[0-9]{1,3}').fullmatch
+_match_roll_number = re.compile(r'[A-Za-z0-9-]{1,16}').fullmatch
+
+RULE = '=' * 60
+STUDENT_ROW_FMT = "{:<10} | {:<20} | {:<5} | {:<10}\n".format
+STUDENT_TABLE_HEADER = STUDENT_ROW_FMT('Roll No.', 'Name', 'Age', 'Class') + '-' * 60 + "\n"
 
 class Student:
+    __slots__ = ('name', 'age', 'student_class', 'roll_number', '_cached_dict')
+
     def __init__(self, name, age, student_class, roll_number):
         self.name = name
         self.age = age
         self.student_class = student_class
         self.roll_number = roll_number
+        self._cached_dict = None
 
     def to_dict(self):
-        return {
-            'name': self.name,
-            'age': self.age,
-            'class': self.student_class,
-            'roll_number': self.roll_number
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                'name': self.name,
+                'age': self.age,
+                'class': self.student_class,
+                'roll_number': self.roll_number
+            }
+        return self._cached_dict
+
+    def invalidate(self):
+        self._cached_dict = None
 
     @classmethod
     def from_dict(cls, data):
@@ -27,46 +61,169 @@ class Student:
         )
 
 class StudentManager:
-    def __init__(self, filename="students.json", log_filename="master_log.json"):
+    def __init__(self, filename="students.json", log_filename="master_log.jsonl",
+                 log_index_filename="log_index.pkl", log_views=True, log_limit=None):
         self.filename = filename
         self.log_filename = log_filename
+        self.log_index_filename = log_index_filename
+        self.log_views = log_views
+        self.log_limit = log_limit
+        self._view_counts = Counter()
         self.students = {}
+        self._dirty = False
         self.load_students()
+        self._migrate_legacy_log()
+        # Unbuffered: log_action already batches lines, so each flush is one write(2).
+        self._log_fp = open(self.log_filename, 'ab', buffering=0)
+        # Buffered (line, entry) pairs; entries are indexed once flush_logs knows their offsets.
+        self._log_buf = []
+        self._log_buf_bytes = 0
+        self._ts_cache = (0, '')
+        self._log_end = self._log_fp.tell()
+        self._log_mm = None
+        self.load_log_index()
+        atexit.register(self._log_fp.close)
+        atexit.register(self.flush_logs)
+        atexit.register(self.save_log_index)
+        atexit.register(self.save_if_dirty)
 
-    def log_action(self, action, student=None, details=None):
+    def _migrate_legacy_log(self):
+        # One-time conversion of the old JSON-array master_log.json into JSON Lines.
+        legacy_filename = os.path.splitext(self.log_filename)[0] + '.json'
+        if legacy_filename == self.log_filename:
+            return
+        try:
+            log_fp = open(self.log_filename, 'xb')
+        except FileExistsError:
+            return
+        with log_fp:
+            try:
+                with open(legacy_filename, 'rb') as f:
+                    logs = _loads(f.read())
+            except (OSError, ValueError):
+                return
+            log_fp.writelines(_dumps(log) + b"\n" for log in logs)
+
+    def _timestamp(self):
+        # Logging is second-granular, so format each second only once.
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+        return self._ts_cache[1]
+
+    def _buffer_log_entry(self, timestamp, action, student, details):
         log_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': timestamp,
             'action': action,
             'student': student.to_dict() if student else None,
             'details': details
         }
-        logs = []
-        if os.path.exists(self.log_filename):
-            with open(self.log_filename, 'r') as f:
-                try:
-                    logs = json.load(f)
-                except Exception:
-                    logs = []
-        logs.append(log_entry)
-        with open(self.log_filename, 'w') as f:
-            json.dump(logs, f, indent=2)
+        line = _dumps(log_entry) + b"\n"
+        self._log_buf.append((line, log_entry))
+        self._log_buf_bytes += len(line)
+
+    def log_action(self, action, student=None, details=None):
+        self._buffer_log_entry(self._timestamp(), action, student, details)
+        if self._log_buf_bytes > LOG_FLUSH_BYTES or len(self._log_buf) > LOG_FLUSH_ENTRIES:
+            self.flush_logs()
+
+    def log_many(self, action, students):
+        timestamp = self._timestamp()
+        for student in students:
+            self._buffer_log_entry(timestamp, action, student, None)
+        self.flush_logs()
+
+    def flush_logs(self):
+        # Other writers (e.g. the web app) append to the same log, so offsets come from
+        # the real end of file and lines they appended are indexed too.
+        size = os.fstat(self._log_fp.fileno()).st_size
+        if size != self._log_end:
+            self._index_log_from(0 if size < self._log_end else self._log_end)
+            self._log_end = size
+        if self._log_buf:
+            offset = self._log_end
+            for line, log_entry in self._log_buf:
+                self._index_log_entry(offset, log_entry)
+                offset += len(line)
+            data = memoryview(b"".join(line for line, _ in self._log_buf))
+            while data:
+                data = data[self._log_fp.write(data):]
+            self._log_end = offset
+            self._log_buf.clear()
+            self._log_buf_bytes = 0
+
+    def _index_log_entry(self, offset, log_entry):
+        student = log_entry['student']
+        if student:
+            self._log_index['name'][student['name'].lower()].append(offset)
+            self._log_index['roll_number'][str(student['roll_number'])].append(offset)
+
+    def load_log_index(self):
+        # The persisted index is only trusted if it covers exactly the current log file.
+        try:
+            with open(self.log_index_filename, 'rb') as f:
+                saved = pickle.load(f)
+            if saved['size'] == self._log_end:
+                self._log_index = saved['index']
+                return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Rebuilding log index: {e}")
+        self._index_log_from(0)
+
+    def _index_log_from(self, offset):
+        # Index every line from offset on; offset 0 starts a fresh index.
+        if offset == 0:
+            self._log_index = {'name': defaultdict(list), 'roll_number': defaultdict(list)}
+        with open(self.log_filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if line.strip():
+                    try:
+                        self._index_log_entry(offset, _loads(line))
+                    except ValueError:
+                        pass
+                offset += len(line)
+
+    def save_log_index(self):
+        self.flush_logs()
+        with open(self.log_index_filename, 'wb') as f:
+            pickle.dump({'size': self._log_end, 'index': self._log_index}, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     def load_students(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    self.students = {roll: Student.from_dict(stud) for roll, stud in data.items()}
-            except Exception as e:
-                print(f"Error loading students: {e}")
-                self.students = {}
-        else:
+        try:
+            with open(self.filename, 'rb') as f:
+                data = _loads(f.read())
+            # Construct directly rather than via Student.from_dict to skip a call per record.
+            make_student = Student
+            self.students = {
+                roll: make_student(stud['name'], stud['age'], stud['class'], stud['roll_number'])
+                for roll, stud in data.items()
+            }
+        except FileNotFoundError:
             self.students = {}
+        except Exception as e:
+            print(f"Error loading students: {e}")
+            self.students = {}
+        self._sorted_rolls = sorted(self.students)
+        # Plain-dict mirror of self.students, kept in step by the mutators so saving
+        # hands one ready-made object to the C encoder instead of looping per record.
+        self._records = {roll: student.to_dict() for roll, student in self.students.items()}
 
     def save_students(self):
-        data = {roll: student.to_dict() for roll, student in self.students.items()}
-        with open(self.filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        data_bytes = _dumps(self._records)
+        tmp_filename = self.filename + ".tmp"
+        with open(tmp_filename, 'wb') as f:
+            f.write(data_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+        self._dirty = False
+
+    def save_if_dirty(self):
+        if self._dirty:
+            self.save_students()
 
     def add_student(self, name, age, student_class, roll_number):
         if roll_number in self.students:
@@ -74,16 +231,56 @@ class StudentManager:
             return False
         student = Student(name, age, student_class, roll_number)
         self.students[roll_number] = student
-        self.save_students()
+        self._records[roll_number] = student.to_dict()
+        bisect.insort(self._sorted_rolls, roll_number)
+        self._dirty = True
         self.log_action('add', student)
         print(f"Student '{name}' added successfully!")
         return True
 
+    def bulk_add(self, rows):
+        # rows are raw (name, age, class, roll_number) string tuples, e.g. from csv.reader.
+        students = []
+        for row in rows:
+            if len(row) != 4:
+                if row:
+                    print(f"Skipping invalid record: {row!r}")
+                continue
+            name, age, student_class, roll_number = row
+            name, age = name.strip(), age.strip()
+            student_class, roll_number = student_class.strip(), roll_number.strip()
+            if not (name and student_class and _match_age(age) and _match_roll_number(roll_number)):
+                print(f"Skipping invalid record: {name!r}, {age!r}, {student_class!r}, {roll_number!r}")
+                continue
+            students.append(Student(name, int(age), student_class, roll_number))
+        return self.add_many(students)
+
+    def add_many(self, students):
+        # Stage the whole batch, then insert, re-sort and log it in one pass each.
+        new = {}
+        for student in students:
+            roll_number = student.roll_number
+            if roll_number in self.students or roll_number in new:
+                print(f"Student with roll number {roll_number} already exists!")
+            else:
+                new[roll_number] = student
+        if new:
+            self.students.update(new)
+            self._records.update((roll, student.to_dict()) for roll, student in new.items())
+            self._sorted_rolls.extend(new)
+            self._sorted_rolls.sort()
+            self._dirty = True
+            self.log_many('add', new.values())
+            print(f"{len(new)} students added successfully!")
+        return len(new)
+
     def remove_student(self, roll_number):
         if roll_number in self.students:
             student = self.students[roll_number]
             del self.students[roll_number]
-            self.save_students()
+            del self._records[roll_number]
+            del self._sorted_rolls[bisect.bisect_left(self._sorted_rolls, roll_number)]
+            self._dirty = True
             self.log_action('remove', student)
             print(f"Student with roll number {roll_number} removed successfully!")
             return True
@@ -105,15 +302,18 @@ class StudentManager:
         if new_name:
             updates['name'] = new_name
         if new_age:
-            try:
+            if _match_age(new_age):
                 updates['age'] = int(new_age)
-            except ValueError:
+            else:
                 print("Invalid age. Keeping previous value.")
         if new_class:
             updates['class'] = new_class
         for key, value in updates.items():
             setattr(student, key if key != 'class' else 'student_class', value)
-        self.save_students()
+        if updates:
+            student.invalidate()
+            self._records[roll_number] = student.to_dict()
+            self._dirty = True
         self.log_action('edit', student, details=updates)
         print("Student updated successfully!")
         return True
@@ -122,13 +322,12 @@ class StudentManager:
         if not self.students:
             print("No students found.")
             return
-        print(f"\n{'='*60}")
-        print(f"STUDENT LIST - {len(self.students)} students")
-        print(f"{'='*60}")
-        print(f"{'Roll No.':<10} | {'Name':<20} | {'Age':<5} | {'Class':<10}")
-        print(f"{'-'*60}")
-        for roll, student in sorted(self.students.items()):
-            print(f"{roll:<10} | {student.name:<20} | {student.age:<5} | {student.student_class:<10}")
+        students = self.students
+        lines = [f"\n{RULE}\nSTUDENT LIST - {len(students)} students\n{RULE}\n", STUDENT_TABLE_HEADER]
+        for roll in self._sorted_rolls:
+            student = students[roll]
+            lines.append(STUDENT_ROW_FMT(roll, student.name, student.age, student.student_class))
+        sys.stdout.write("".join(lines))
 
     def display_student(self, roll_number):
         if roll_number in self.students:
@@ -139,37 +338,73 @@ class StudentManager:
             print(f"Class: {student.student_class}")
             print(f"Roll Number: {student.roll_number}")
             print(f"{'='*40}")
-            self.log_action('view', student)
+            if self.log_views:
+                # Views are frequent and need no audit trail of their own, so only
+                # the 1st, 2nd, 4th, 8th, ... view of each roll number is logged.
+                self._view_counts[roll_number] += 1
+                views = self._view_counts[roll_number]
+                if views & (views - 1) == 0:
+                    self.log_action('view', student, details={'views': views})
         else:
             print(f"Student with roll number {roll_number} not found!")
 
     def get_roll_numbers(self):
-        return sorted(self.students.keys())
+        return list(self._sorted_rolls)
 
-    def view_logs(self, filter_by=None, filter_value=None):
-        if not os.path.exists(self.log_filename):
-            print("No logs found.")
+    def iter_logs(self):
+        self.flush_logs()
+        with open(self.log_filename, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+
+    def _log_view(self):
+        # Read-only mapping of the log for offset lookups, remapped whenever the file's
+        # real size no longer matches it (other writers append to the same log).
+        self.flush_logs()
+        size = os.fstat(self._log_fp.fileno()).st_size
+        if self._log_mm is None or len(self._log_mm) != size:
+            if self._log_mm is not None:
+                self._log_mm.close()
+            with open(self.log_filename, 'rb') as f:
+                self._log_mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._log_mm
+
+    def iter_logs_at(self, offsets):
+        if not offsets:
             return
-        with open(self.log_filename, 'r') as f:
-            try:
-                logs = json.load(f)
-            except Exception as e:
-                print(f"Error reading logs: {e}")
-                return
-        filtered_logs = logs
+        mm = self._log_view()
+        for offset in offsets:
+            end = mm.find(b"\n", offset)
+            yield _loads(mm[offset:end if end >= 0 else len(mm)])
+
+    def view_logs(self, filter_by=None, filter_value=None, limit=None):
+        self.flush_logs()
+        logs = self.iter_logs()
         if filter_by and filter_value:
             if filter_by == 'name':
-                filtered_logs = [log for log in logs if log['student'] and log['student']['name'].lower() == filter_value.lower()]
+                logs = self.iter_logs_at(self._log_index['name'].get(filter_value.lower(), ()))
             elif filter_by == 'roll_number':
-                filtered_logs = [log for log in logs if log['student'] and str(log['student']['roll_number']) == str(filter_value)]
+                logs = self.iter_logs_at(self._log_index['roll_number'].get(str(filter_value), ()))
+        if limit is not None:
+            logs = islice(logs, limit)
+        try:
+            filtered_logs = list(logs)
+        except ValueError as e:
+            print(f"Error reading logs: {e}")
+            return
+        if not filtered_logs and not (filter_by and filter_value):
+            print("No logs found.")
+            return
         if not filtered_logs:
             print("No logs found for the given filter.")
             return
-        print(f"\n{'='*60}")
-        print(f"MASTER LOGS ({len(filtered_logs)} entries)")
-        print(f"{'='*60}")
-        for log in filtered_logs:
-            print(f"[{log['timestamp']}] {log['action'].upper()} - {log['student'] if log['student'] else ''} {log['details'] if log['details'] else ''}")
+        lines = [f"\n{RULE}\nMASTER LOGS ({len(filtered_logs)} entries)\n{RULE}\n"]
+        lines.extend(
+            f"[{log['timestamp']}] {log['action'].upper()} - {log['student'] if log['student'] else ''} {log['details'] if log['details'] else ''}\n"
+            for log in filtered_logs
+        )
+        sys.stdout.write("".join(lines))
 
 
 def display_menu():
@@ -193,7 +428,7 @@ def get_student_input():
         print("Name is required!")
         return None
     age = input("Enter age: ").strip()
-    if not age.isdigit():
+    if not _match_age(age):
         print("Age must be a number!")
         return None
     student_class = input("Enter class: ").strip()
@@ -206,53 +441,113 @@ def get_student_input():
         return None
     return name, int(age), student_class, roll_number
 
-def main():
-    manager = StudentManager()
+def _input_or_eof(prompt=""):
+    try:
+        return input(prompt).strip()
+    except EOFError:
+        return None
+
+def _handle_add(manager):
+    print("\n--- ADD NEW STUDENT ---")
+    student_data = get_student_input()
+    if student_data:
+        name, age, student_class, roll_number = student_data
+        manager.add_student(name, age, student_class, roll_number)
+
+def _handle_remove(manager):
+    print("\n--- REMOVE STUDENT ---")
+    manager.display_all_students()
+    roll_number = input("Enter roll number to remove: ").strip()
+    if roll_number:
+        manager.remove_student(roll_number)
+
+def _handle_edit(manager):
+    print("\n--- EDIT STUDENT ---")
+    manager.display_all_students()
+    roll_number = input("Enter roll number to edit: ").strip()
+    if roll_number:
+        manager.edit_student(roll_number)
+
+def _handle_display_all(manager):
+    manager.display_all_students()
+
+def _handle_display(manager):
+    roll_number = input("Enter roll number to display: ").strip()
+    if roll_number:
+        manager.display_student(roll_number)
+
+def _handle_view_logs(manager):
+    manager.view_logs(limit=manager.log_limit)
+
+def _handle_logs_by_name(manager):
+    name = input("Enter student name to filter logs: ").strip()
+    if name:
+        manager.view_logs(filter_by='name', filter_value=name, limit=manager.log_limit)
+
+def _handle_logs_by_roll_number(manager):
+    roll_number = input("Enter roll number to filter logs: ").strip()
+    if roll_number:
+        manager.view_logs(filter_by='roll_number', filter_value=roll_number, limit=manager.log_limit)
+
+def _handle_exit(manager):
+    return True
+
+def _handle_invalid(manager):
+    print("Invalid choice! Please enter a number between 1 and 9.")
+
+DISPATCH = {
+    '1': _handle_add,
+    '2': _handle_remove,
+    '3': _handle_edit,
+    '4': _handle_display_all,
+    '5': _handle_display,
+    '6': _handle_view_logs,
+    '7': _handle_logs_by_name,
+    '8': _handle_logs_by_roll_number,
+    '9': _handle_exit,
+}
+
+def run(manager, batch=False):
+    # In batch mode stdin is a command file: no menu, no pauses, and everything
+    # is persisted once when the file runs out.
     while True:
-        display_menu()
-        choice = input("\nEnter your choice (1-9): ").strip()
-        if choice == '1':
-            print("\n--- ADD NEW STUDENT ---")
-            student_data = get_student_input()
-            if student_data:
-                name, age, student_class, roll_number = student_data
-                manager.add_student(name, age, student_class, roll_number)
-        elif choice == '2':
-            print("\n--- REMOVE STUDENT ---")
-            manager.display_all_students()
-            roll_number = input("Enter roll number to remove: ").strip()
-            if roll_number:
-                manager.remove_student(roll_number)
-        elif choice == '3':
-            print("\n--- EDIT STUDENT ---")
-            manager.display_all_students()
-            roll_number = input("Enter roll number to edit: ").strip()
-            if roll_number:
-                manager.edit_student(roll_number)
-        elif choice == '4':
-            manager.display_all_students()
-        elif choice == '5':
-            roll_number = input("Enter roll number to display: ").strip()
-            if roll_number:
-                manager.display_student(roll_number)
-        elif choice == '6':
-            manager.view_logs()
-        elif choice == '7':
-            name = input("Enter student name to filter logs: ").strip()
-            if name:
-                manager.view_logs(filter_by='name', filter_value=name)
-        elif choice == '8':
-            roll_number = input("Enter roll number to filter logs: ").strip()
-            if roll_number:
-                manager.view_logs(filter_by='roll_number', filter_value=roll_number)
-        elif choice == '9':
-            print("\nSaving data before exit...")
-            manager.save_students()
-            print("Thank you for using Student Info System!")
+        if not batch:
+            display_menu()
+        choice = _input_or_eof("\nEnter your choice (1-9): ")
+        if choice is None:
             break
-        else:
-            print("Invalid choice! Please enter a number between 1 and 9.")
-        input("\nPress Enter to continue...")
+        if batch and not choice:
+            continue
+        try:
+            if DISPATCH.get(choice, _handle_invalid)(manager):
+                break
+        except EOFError:
+            break
+        if not batch and _input_or_eof("\nPress Enter to continue...") is None:
+            break
+    print("\nSaving data before exit...")
+    manager.save_students()
+    manager.flush_logs()
+    manager.save_log_index()
+    print("Thank you for using Student Info System!")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Student Info System")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="read menu choices and their answers from FILE, one per line")
+    parser.add_argument('--log-limit', metavar='N', type=int,
+                        help="show at most N entries when viewing or searching the log")
+    args = parser.parse_args(argv)
+    manager = StudentManager(log_limit=args.log_limit)
+    if args.batch:
+        with open(args.batch, 'r') as f:
+            sys.stdin = f
+            try:
+                run(manager, batch=True)
+            finally:
+                sys.stdin = sys.__stdin__
+    else:
+        run(manager)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,10 +1,154 @@
-from flask import Flask, render_template_string, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash
+from jinja2 import DictLoader
+from werkzeug.security import generate_password_hash, check_password_hash
+import atexit
+import hashlib
+import hmac
 import json
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import orjson
+
+    def _dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None).encode()
+    _loads = json.loads
+
+LOG_BATCH_BYTES = 4096
+LOG_BATCH_ENTRIES = 100
+LOG_BATCH_SECONDS = 0.2
+SAVE_DELAY_SECONDS = 0.1
+PASSWORD_CHECK_CACHE_SIZE = 1024
+
+# --- File helpers ---
+def _write_atomic(filename, data):
+    # Write beside the target and rename over it, so a crash never leaves a partial file.
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_filename, filename)
+
+# --- Password helpers ---
+def _is_password_hash(value):
+    return value.startswith(('scrypt:', 'pbkdf2:')) and value.count('$') == 2
+
+# Hash checks are deliberately slow, so results are cached per (stored hash, candidate).
+# Candidates are keyed by a keyed digest, so no plaintext password stays in memory.
+_password_checks = {}
+_password_checks_lock = threading.Lock()
+_password_checks_key = os.urandom(32)
+
+def _check_password(password_hash, password):
+    key = (password_hash, hmac.new(_password_checks_key, password.encode(), hashlib.sha256).digest())
+    with _password_checks_lock:
+        ok = _password_checks.pop(key, None)
+        if ok is not None:
+            _password_checks[key] = ok
+            return ok
+    ok = check_password_hash(password_hash, password)
+    with _password_checks_lock:
+        _password_checks[key] = ok
+        if len(_password_checks) > PASSWORD_CHECK_CACHE_SIZE:
+            del _password_checks[next(iter(_password_checks))]
+    return ok
+
+def _clear_password_checks():
+    with _password_checks_lock:
+        _password_checks.clear()
+
+# --- Timestamps ---
+_ts_cache = (0, '')
+
+def _timestamp():
+    # Timestamps are second-granular, so each second is formatted only once.
+    global _ts_cache
+    now = int(time.time())
+    cached = _ts_cache
+    if now != cached[0]:
+        cached = _ts_cache = (now, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)))
+    return cached[1]
+
+# --- Log file helpers ---
+# Log lines are queued as (log_filename, line) and appended by a background
+# writer in batches, so requests never wait on log I/O.
+_log_queue = queue.Queue()
+
+def _write_log_batch(batch):
+    lines_by_file = {}
+    for log_filename, line in batch:
+        lines_by_file.setdefault(log_filename, []).append(line)
+    for log_filename, lines in lines_by_file.items():
+        with open(log_filename, 'ab', buffering=1 << 16) as f:
+            f.write(b"".join(lines))
+
+def _log_writer():
+    while True:
+        item = _log_queue.get()
+        batch = []
+        batch_bytes = 0
+        deadline = time.monotonic() + LOG_BATCH_SECONDS
+        # A flush request (an Event) ends the batch early; everything queued before it is in this batch.
+        while not isinstance(item, threading.Event):
+            batch.append(item)
+            batch_bytes += len(item[1])
+            if len(batch) >= LOG_BATCH_ENTRIES or batch_bytes >= LOG_BATCH_BYTES:
+                item = None
+                break
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                item = None
+                break
+            try:
+                item = _log_queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+                break
+        if batch:
+            try:
+                _write_log_batch(batch)
+            except Exception as e:
+                print(f"Error writing logs: {e}")
+        if item is not None:
+            item.set()
+
+def flush_logs():
+    # Wait only for the lines queued before this call, not for later writers.
+    flushed = threading.Event()
+    _log_queue.put(flushed)
+    flushed.wait()
+
+threading.Thread(target=_log_writer, name='log-writer', daemon=True).start()
+atexit.register(flush_logs)
+
+def migrate_legacy_log(log_filename):
+    # One-time conversion of an old JSON-array log (same name, .json) into JSON Lines.
+    legacy_filename = os.path.splitext(log_filename)[0] + '.json'
+    if legacy_filename == log_filename:
+        return
+    try:
+        log_fp = open(log_filename, 'xb')
+    except FileExistsError:
+        return
+    with log_fp:
+        try:
+            with open(legacy_filename, 'rb') as f:
+                logs = _loads(f.read())
+        except (OSError, ValueError):
+            return
+        log_fp.write(b"".join(_dumps(log) + b"\n" for log in logs))
 
 # --- Student and StudentManager classes (updated for teacher association) ---
 class Student:
+    __slots__ = ('name', 'age', 'student_class', 'roll_number', 'teacher_username')
+
     def __init__(self, name, age, student_class, roll_number, teacher_username=None):
         self.name = name
         self.age = age
@@ -32,116 +176,186 @@ class Student:
         )
 
 class StudentManager:
-    def __init__(self, filename="students.json", log_filename="master_log.json"):
+    def __init__(self, filename="students.json", log_filename="master_log.jsonl"):
         self.filename = filename
         self.log_filename = log_filename
         self.students = {}
+        self._sorted_cache = None
+        self._by_teacher = defaultdict(set)
+        self._logs_cache = []
+        self._logs_bytes = 0
+        self._logs_mtime = 0
+        self._dirty = False
+        self._save_timer = None
+        self._lock = threading.RLock()
         self.load_students()
+        migrate_legacy_log(self.log_filename)
+        atexit.register(self.flush)
 
     def log_action(self, action, student=None, details=None):
         log_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': _timestamp(),
             'action': action,
             'student': student.to_dict() if student else None,
             'details': details
         }
-        logs = []
-        if os.path.exists(self.log_filename):
-            with open(self.log_filename, 'r') as f:
-                try:
-                    logs = json.load(f)
-                except Exception:
-                    logs = []
-        logs.append(log_entry)
-        with open(self.log_filename, 'w') as f:
-            json.dump(logs, f, indent=2)
+        _log_queue.put((self.log_filename, _dumps(log_entry) + b"\n"))
 
     def load_students(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    self.students = {roll: Student.from_dict(stud) for roll, stud in data.items()}
-            except Exception as e:
-                print(f"Error loading students: {e}")
-                self.students = {}
-        else:
+        try:
+            with open(self.filename, 'rb') as f:
+                data = _loads(f.read())
+            self.students = {roll: Student.from_dict(stud) for roll, stud in data.items()}
+        except FileNotFoundError:
             self.students = {}
+        except Exception as e:
+            print(f"Error loading students: {e}")
+            self.students = {}
+        self._by_teacher.clear()
+        for roll, student in self.students.items():
+            self._by_teacher[student.teacher_username].add(roll)
 
     def save_students(self):
-        data = {roll: student.to_dict() for roll, student in self.students.items()}
-        with open(self.filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        with self._lock:
+            data = {roll: student.to_dict() for roll, student in self.students.items()}
+            _write_atomic(self.filename, _dumps(data, indent=True))
+
+    def _schedule_save(self):
+        # Coalesce a burst of mutations into one save shortly after the last of them.
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._dirty = False
+                self.save_students()
 
     def add_student(self, name, age, student_class, roll_number, teacher_username=None):
-        if roll_number in self.students:
-            return False, f"Student with roll number {roll_number} already exists!"
-        student = Student(name, age, student_class, roll_number, teacher_username)
-        self.students[roll_number] = student
-        self.save_students()
-        self.log_action('add', student)
-        return True, f"Student '{name}' added successfully!"
+        with self._lock:
+            if roll_number in self.students:
+                return False, f"Student with roll number {roll_number} already exists!"
+            student = Student(name, age, student_class, roll_number, teacher_username)
+            self.students[roll_number] = student
+            self._by_teacher[teacher_username].add(roll_number)
+            self._sorted_cache = None
+            self._schedule_save()
+            self.log_action('add', student)
+            return True, f"Student '{name}' added successfully!"
 
     def remove_student(self, roll_number):
-        if roll_number in self.students:
-            student = self.students[roll_number]
-            del self.students[roll_number]
-            self.save_students()
-            self.log_action('remove', student)
-            return True, f"Student with roll number {roll_number} removed successfully!"
-        else:
-            return False, f"Student with roll number {roll_number} not found!"
+        with self._lock:
+            if roll_number in self.students:
+                student = self.students[roll_number]
+                del self.students[roll_number]
+                self._by_teacher[student.teacher_username].discard(roll_number)
+                self._sorted_cache = None
+                self._schedule_save()
+                self.log_action('remove', student)
+                return True, f"Student with roll number {roll_number} removed successfully!"
+            else:
+                return False, f"Student with roll number {roll_number} not found!"
 
     def edit_student(self, roll_number, name=None, age=None, student_class=None, teacher_username=None):
-        if roll_number not in self.students:
-            return False, f"Student with roll number {roll_number} not found!"
-        student = self.students[roll_number]
-        updates = {}
-        if name:
-            updates['name'] = name
-        if age:
-            updates['age'] = age
-        if student_class:
-            updates['class'] = student_class
-        if teacher_username is not None:
-            updates['teacher_username'] = teacher_username
-        for key, value in updates.items():
-            setattr(student, key if key != 'class' else 'student_class', value)
-        self.save_students()
-        self.log_action('edit', student, details=updates)
-        return True, "Student updated successfully!"
+        with self._lock:
+            if roll_number not in self.students:
+                return False, f"Student with roll number {roll_number} not found!"
+            student = self.students[roll_number]
+            updates = {}
+            if name:
+                updates['name'] = name
+            if age:
+                updates['age'] = age
+            if student_class:
+                updates['class'] = student_class
+            if teacher_username is not None:
+                updates['teacher_username'] = teacher_username
+                self._by_teacher[student.teacher_username].discard(roll_number)
+                self._by_teacher[teacher_username].add(roll_number)
+            for key, value in updates.items():
+                setattr(student, key if key != 'class' else 'student_class', value)
+            self._schedule_save()
+            self.log_action('edit', student, details=updates)
+            return True, "Student updated successfully!"
 
     def get_student(self, roll_number):
         return self.students.get(roll_number)
 
     def get_all_students(self, teacher_username=None):
-        students = list(self.students.values())
-        if teacher_username:
-            students = [s for s in students if s.teacher_username == teacher_username]
-        return sorted(students, key=lambda s: s.roll_number)
+        with self._lock:
+            if teacher_username:
+                rolls = self._by_teacher.get(teacher_username, ())
+                return sorted((self.students[roll] for roll in rolls), key=lambda s: s.roll_number)
+            # Edits never change a roll number, so only add/remove invalidate the cache.
+            if self._sorted_cache is None:
+                self._sorted_cache = sorted(self.students.values(), key=lambda s: s.roll_number)
+            return self._sorted_cache
 
     def view_logs(self, filter_by=None, filter_value=None):
-        if not os.path.exists(self.log_filename):
-            return []
-        with open(self.log_filename, 'r') as f:
+        flush_logs()
+        with self._lock:
             try:
-                logs = json.load(f)
-            except Exception:
+                st = os.stat(self.log_filename)
+            except FileNotFoundError:
                 return []
-        filtered_logs = logs
-        if filter_by and filter_value:
-            if filter_by == 'name':
-                filtered_logs = [log for log in logs if log['student'] and log['student']['name'].lower() == filter_value.lower()]
-            elif filter_by == 'roll_number':
-                filtered_logs = [log for log in logs if log['student'] and str(log['student']['roll_number']) == str(filter_value)]
-        return filtered_logs
+            # The log is append-only, so only parse what was written since the last call.
+            # A shrunk file, or one rewritten in place, is reparsed from the start.
+            if st.st_size < self._logs_bytes or (st.st_size == self._logs_bytes and st.st_mtime_ns != self._logs_mtime):
+                self._logs_cache = []
+                self._logs_bytes = 0
+            if st.st_size > self._logs_bytes:
+                with open(self.log_filename, 'rb') as f:
+                    f.seek(self._logs_bytes)
+                    chunk = f.read()
+                # Leave a trailing partial line for the next call.
+                chunk = chunk[:chunk.rfind(b'\n') + 1]
+                self._logs_bytes += len(chunk)
+                for line in chunk.splitlines():
+                    if not line.strip():
+                        continue
+                    # Skip lines that don't decode (e.g. left torn by a crash) rather than hiding the whole log.
+                    try:
+                        log = _loads(line)
+                        student = log.get('student')
+                        self._logs_cache.append(
+                            (student['name'].lower(), str(student['roll_number']), log) if student
+                            else (None, None, log)
+                        )
+                    except Exception as e:
+                        print(f"Skipping unreadable log line: {e}")
+            self._logs_mtime = st.st_mtime_ns
+            if filter_by and filter_value:
+                if filter_by == 'name':
+                    name = filter_value.lower()
+                    return [log for name_lower, _, log in self._logs_cache if name_lower == name]
+                elif filter_by == 'roll_number':
+                    roll_number = str(filter_value)
+                    return [log for _, roll_str, log in self._logs_cache if roll_str == roll_number]
+            return [log for _, _, log in self._logs_cache]
+
+# --- Log row passed to the master log template ---
+class LogRow:
+    __slots__ = ('timestamp', 'action', 'student', 'details')
+
+    def __init__(self, timestamp, action, student, details):
+        self.timestamp = timestamp
+        self.action = action
+        self.student = student
+        self.details = details
 
 # --- Teacher and TeacherManager classes ---
 class Teacher:
+    __slots__ = ('username', 'password', 'last_password_change')
+
     def __init__(self, username, password, last_password_change=None):
         self.username = username
         self.password = password
-        self.last_password_change = last_password_change or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.last_password_change = last_password_change or _timestamp()
 
     def to_dict(self):
         return {
@@ -159,102 +373,161 @@ class Teacher:
         )
 
 class TeacherManager:
-    def __init__(self, filename="teachers.json", log_filename="teacher_log.json"):
+    def __init__(self, filename="teachers.json", log_filename="teacher_log.jsonl"):
         self.filename = filename
         self.log_filename = log_filename
         self.teachers = {}
+        self._sorted_cache = None
+        self._dirty = False
+        self._save_timer = None
+        self._lock = threading.RLock()
         self.load_teachers()
+        migrate_legacy_log(self.log_filename)
+        self.scrub_log_passwords()
+        atexit.register(self.flush)
 
     def log_action(self, action, teacher=None, details=None):
         log_entry = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': _timestamp(),
             'action': action,
-            'teacher': teacher.to_dict() if teacher else None,
+            'teacher': {'username': teacher.username, 'last_password_change': teacher.last_password_change} if teacher else None,
             'details': details
         }
-        logs = []
-        if os.path.exists(self.log_filename):
-            with open(self.log_filename, 'r') as f:
-                try:
-                    logs = json.load(f)
-                except Exception:
-                    logs = []
-        logs.append(log_entry)
-        with open(self.log_filename, 'w') as f:
-            json.dump(logs, f, indent=2)
+        _log_queue.put((self.log_filename, _dumps(log_entry) + b"\n"))
+
+    def scrub_log_passwords(self):
+        # Logs written by older versions (and the legacy log they were migrated from) recorded passwords.
+        flush_logs()
+        try:
+            with open(self.log_filename, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        if b'"password"' not in data:
+            return
+        lines = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                log = _loads(line)
+            except ValueError:
+                lines.append(line + b"\n")
+                continue
+            for key in ('teacher', 'details'):
+                if isinstance(log.get(key), dict):
+                    log[key].pop('password', None)
+            lines.append(_dumps(log) + b"\n")
+        _write_atomic(self.log_filename, b"".join(lines))
 
     def load_teachers(self):
-        if os.path.exists(self.filename):
-            try:
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
-                    self.teachers = {uname: Teacher.from_dict(t) for uname, t in data.items()}
-            except Exception as e:
-                print(f"Error loading teachers: {e}")
-                self.teachers = {}
-        else:
+        try:
+            with open(self.filename, 'rb') as f:
+                data = _loads(f.read())
+            self.teachers = {uname: Teacher.from_dict(t) for uname, t in data.items()}
+        except FileNotFoundError:
+            self.teachers = {}
+        except Exception as e:
+            print(f"Error loading teachers: {e}")
             self.teachers = {}
+        # One-time migration of passwords saved as plaintext by older versions.
+        for teacher in self.teachers.values():
+            if not _is_password_hash(teacher.password):
+                teacher.password = generate_password_hash(teacher.password)
+                self._dirty = True
+        if self._dirty:
+            self.save_teachers()
+            self._dirty = False
 
     def save_teachers(self):
-        data = {uname: teacher.to_dict() for uname, teacher in self.teachers.items()}
-        with open(self.filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        with self._lock:
+            data = {uname: teacher.to_dict() for uname, teacher in self.teachers.items()}
+            _write_atomic(self.filename, _dumps(data, indent=True))
+
+    def _schedule_save(self):
+        # Coalesce a burst of mutations into one save shortly after the last of them.
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._dirty = False
+                self.save_teachers()
 
     def add_teacher(self, username, password):
-        if username in self.teachers:
-            return False, f"Teacher with username {username} already exists!"
-        teacher = Teacher(username, password)
-        self.teachers[username] = teacher
-        self.save_teachers()
-        self.log_action('add', teacher)
-        return True, f"Teacher '{username}' added successfully!"
+        with self._lock:
+            if username in self.teachers:
+                return False, f"Teacher with username {username} already exists!"
+            teacher = Teacher(username, generate_password_hash(password))
+            self.teachers[username] = teacher
+            self._sorted_cache = None
+            self._schedule_save()
+            self.log_action('add', teacher)
+            return True, f"Teacher '{username}' added successfully!"
 
     def remove_teacher(self, username):
-        if username in self.teachers:
-            teacher = self.teachers[username]
-            del self.teachers[username]
-            self.save_teachers()
-            self.log_action('remove', teacher)
-            return True, f"Teacher '{username}' removed successfully!"
-        else:
-            return False, f"Teacher with username {username} not found!"
+        with self._lock:
+            if username in self.teachers:
+                teacher = self.teachers[username]
+                del self.teachers[username]
+                self._sorted_cache = None
+                _clear_password_checks()
+                self._schedule_save()
+                self.log_action('remove', teacher)
+                return True, f"Teacher '{username}' removed successfully!"
+            else:
+                return False, f"Teacher with username {username} not found!"
 
     def edit_teacher(self, username, new_password=None):
-        if username not in self.teachers:
-            return False, f"Teacher with username {username} not found!"
-        teacher = self.teachers[username]
-        updates = {}
-        if new_password and new_password != teacher.password:
-            teacher.password = new_password
-            teacher.last_password_change = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            updates['password'] = new_password
-            updates['last_password_change'] = teacher.last_password_change
-        self.save_teachers()
-        if updates:
-            self.log_action('edit_password', teacher, details=updates)
-        return True, "Teacher updated successfully!"
+        with self._lock:
+            if username not in self.teachers:
+                return False, f"Teacher with username {username} not found!"
+            teacher = self.teachers[username]
+            updates = {}
+            if new_password and not _check_password(teacher.password, new_password):
+                teacher.password = generate_password_hash(new_password)
+                teacher.last_password_change = _timestamp()
+                updates['last_password_change'] = teacher.last_password_change
+            if updates:
+                _clear_password_checks()
+                self._schedule_save()
+                self.log_action('edit_password', teacher, details=updates)
+            return True, "Teacher updated successfully!"
 
     def get_teacher(self, username):
         return self.teachers.get(username)
 
+    def verify(self, username, password):
+        # The slow hash check runs outside the lock so logins don't serialize.
+        teacher = self.teachers.get(username)
+        return teacher is not None and _check_password(teacher.password, password)
+
     def get_all_teachers(self):
-        return sorted(self.teachers.values(), key=lambda t: t.username)
+        # Usernames are never edited, so only add/remove invalidate the cache.
+        with self._lock:
+            if self._sorted_cache is None:
+                self._sorted_cache = sorted(self.teachers.values(), key=lambda t: t.username)
+            return self._sorted_cache
 
     def view_logs(self):
-        if not os.path.exists(self.log_filename):
+        flush_logs()
+        try:
+            with open(self.log_filename, 'rb') as f:
+                return [_loads(line) for line in f if line.strip()]
+        except (FileNotFoundError, json.JSONDecodeError):
             return []
-        with open(self.log_filename, 'r') as f:
-            try:
-                logs = json.load(f)
-            except Exception:
-                return []
-        return logs
 
 # --- Flask App ---
 app = Flask(__name__)
 app.secret_key = 'student-info-secret'
-manager = StudentManager(os.path.join(os.path.dirname(__file__), 'students.json'), os.path.join(os.path.dirname(__file__), 'master_log.json'))
-teacher_manager = TeacherManager(os.path.join(os.path.dirname(__file__), 'teachers.json'), os.path.join(os.path.dirname(__file__), 'teacher_log.json'))
+manager = StudentManager(os.path.join(os.path.dirname(__file__), 'students.json'), os.path.join(os.path.dirname(__file__), 'master_log.jsonl'))
+teacher_manager = TeacherManager(os.path.join(os.path.dirname(__file__), 'teachers.json'), os.path.join(os.path.dirname(__file__), 'teacher_log.jsonl'))
 
 # --- HTML Templates ---
 layout = '''
@@ -321,7 +594,7 @@ layout = '''
         {% endfor %}
       {% endif %}
     {% endwith %}
-    CONTENT_BLOCK
+    {% block content %}{% endblock %}
 </div>
 </body>
 </html>
@@ -329,15 +602,15 @@ layout = '''
 
 # ... (student templates unchanged)
 
-principal_content = '''
+principal_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>Principal Dashboard - Teachers</h1>
 <a href="{{ url_for('add_teacher') }}"><button>Add Teacher</button></a>
 <table>
-    <tr><th>Username</th><th>Password</th><th>Last Password Change</th><th>Actions</th></tr>
+    <tr><th>Username</th><th>Last Password Change</th><th>Actions</th></tr>
     {% for teacher in teachers %}
     <tr>
         <td>{{ teacher.username }}</td>
-        <td>{{ teacher.password }}</td>
         <td>{{ teacher.last_password_change }}</td>
         <td class="actions">
             <a href="{{ url_for('edit_teacher', username=teacher.username) }}">Edit</a>
@@ -346,9 +619,11 @@ principal_content = '''
     </tr>
     {% endfor %}
 </table>
+{% endblock %}
 '''
 
-add_teacher_content = '''
+add_teacher_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>Add Teacher</h1>
 <form method="post">
     <label>Username:<br><input type="text" name="username" required></label><br><br>
@@ -356,20 +631,24 @@ add_teacher_content = '''
     <input type="submit" value="Add Teacher">
     <a href="{{ url_for('principal_dashboard') }}"><button type="button">Cancel</button></a>
 </form>
+{% endblock %}
 '''
 
-edit_teacher_content = '''
+edit_teacher_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>Edit Teacher - {{ teacher.username }}</h1>
 <form method="post">
-    <label>New Password:<br><input type="password" name="password" value="{{ teacher.password }}" required></label><br><br>
+    <label>New Password:<br><input type="password" name="password" required></label><br><br>
     <input type="submit" value="Update Password">
     <a href="{{ url_for('principal_dashboard') }}"><button type="button">Cancel</button></a>
 </form>
 <p>Last Password Change: {{ teacher.last_password_change }}</p>
+{% endblock %}
 '''
 
 # --- Student templates (unchanged) ---
-index_content = '''
+index_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>Student List</h1>
 <form method="get" style="margin-bottom:1em;">
     <label>Filter by Teacher:
@@ -403,9 +682,11 @@ index_content = '''
 {% else %}
 <p>No students found.</p>
 {% endif %}
+{% endblock %}
 '''
 
-add_edit_content = '''
+add_edit_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>{{ 'Edit' if edit else 'Add' }} Student</h1>
 <form method="post">
     <label>Name:<br><input type="text" name="name" value="{{ student.name if student else '' }}" required></label><br><br>
@@ -423,9 +704,11 @@ add_edit_content = '''
     <input type="submit" value="{{ 'Update' if edit else 'Add' }} Student">
     <a href="{{ url_for('index') }}"><button type="button">Cancel</button></a>
 </form>
+{% endblock %}
 '''
 
-view_content = '''
+view_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>Student Details</h1>
 {% if student %}
 <table>
@@ -440,9 +723,11 @@ view_content = '''
 {% else %}
 <p>Student not found.</p>
 {% endif %}
+{% endblock %}
 '''
 
-log_content = '''
+log_content = '''{% extends "layout.html" %}
+{% block content %}
 <h1>Master Log</h1>
 <form method="get" style="margin-bottom:1em;">
     <label>Filter by Name: <input type="text" name="name" value="{{ request.args.get('name', '') }}"></label>
@@ -466,16 +751,30 @@ log_content = '''
 {% else %}
 <p>No logs found.</p>
 {% endif %}
+{% endblock %}
 '''
 
+# --- Template loader ---
+# Pages extend "layout.html"; Jinja compiles each once and caches it. The .html
+# names keep Flask's autoescaping on for every page.
+app.jinja_env.loader = DictLoader({
+    'layout.html': layout,
+    'index.html': index_content,
+    'add_edit.html': add_edit_content,
+    'view.html': view_content,
+    'log.html': log_content,
+    'principal.html': principal_content,
+    'add_teacher.html': add_teacher_content,
+    'edit_teacher.html': edit_teacher_content,
+})
+
 # --- Flask Routes ---
 @app.route('/')
 def index():
     selected_teacher = request.args.get('teacher_username', '')
     students = manager.get_all_students(teacher_username=selected_teacher if selected_teacher else None)
     teachers = teacher_manager.get_all_teachers()
-    page = layout.replace('CONTENT_BLOCK', index_content)
-    return render_template_string(page, students=students, teachers=teachers, selected_teacher=selected_teacher)
+    return render_template('index.html', students=students, teachers=teachers, selected_teacher=selected_teacher)
 
 @app.route('/add', methods=['GET', 'POST'])
 def add_student():
@@ -488,14 +787,12 @@ def add_student():
         teacher_username = request.form.get('teacher_username') or None
         if not (name and age.isdigit() and student_class and roll_number):
             flash('All fields are required and age must be a number.', 'err')
-            page = layout.replace('CONTENT_BLOCK', add_edit_content)
-            return render_template_string(page, edit=False, student=None, teachers=teachers)
+            return render_template('add_edit.html', edit=False, student=None, teachers=teachers)
         success, msg = manager.add_student(name, int(age), student_class, roll_number, teacher_username)
         flash(msg, 'msg' if success else 'err')
         if success:
             return redirect(url_for('index'))
-    page = layout.replace('CONTENT_BLOCK', add_edit_content)
-    return render_template_string(page, edit=False, student=None, teachers=teachers)
+    return render_template('add_edit.html', edit=False, student=None, teachers=teachers)
 
 @app.route('/edit/<roll_number>', methods=['GET', 'POST'])
 def edit_student(roll_number):
@@ -511,14 +808,12 @@ def edit_student(roll_number):
         teacher_username = request.form.get('teacher_username') or None
         if not (name and age.isdigit() and student_class):
             flash('All fields are required and age must be a number.', 'err')
-            page = layout.replace('CONTENT_BLOCK', add_edit_content)
-            return render_template_string(page, edit=True, student=student, teachers=teachers)
+            return render_template('add_edit.html', edit=True, student=student, teachers=teachers)
         success, msg = manager.edit_student(roll_number, name, int(age), student_class, teacher_username)
         flash(msg, 'msg' if success else 'err')
         if success:
             return redirect(url_for('index'))
-    page = layout.replace('CONTENT_BLOCK', add_edit_content)
-    return render_template_string(page, edit=True, student=student, teachers=teachers)
+    return render_template('add_edit.html', edit=True, student=student, teachers=teachers)
 
 @app.route('/remove/<roll_number>')
 def remove_student(roll_number):
@@ -529,8 +824,7 @@ def remove_student(roll_number):
 @app.route('/view/<roll_number>')
 def view_student(roll_number):
     student = manager.get_student(roll_number)
-    page = layout.replace('CONTENT_BLOCK', view_content)
-    return render_template_string(page, student=student)
+    return render_template('view.html', student=student)
 
 @app.route('/logs')
 def view_logs():
@@ -546,22 +840,17 @@ def view_logs():
         filter_value = roll_number
     logs = manager.view_logs(filter_by, filter_value)
     # Convert logs to objects for template
-    class LogObj:
-        def __init__(self, d):
-            self.timestamp = d['timestamp']
-            self.action = d['action']
-            self.student = type('S', (), d['student']) if d['student'] else None
-            self.details = d['details']
-    logs = [LogObj(l) for l in logs]
-    page = layout.replace('CONTENT_BLOCK', log_content)
-    return render_template_string(page, logs=logs, request=request)
+    logs = [
+        LogRow(l['timestamp'], l['action'], Student.from_dict(l['student']) if l['student'] else None, l['details'])
+        for l in logs
+    ]
+    return render_template('log.html', logs=logs, request=request)
 
 # --- Principal Dashboard routes ---
 @app.route('/principal')
 def principal_dashboard():
     teachers = teacher_manager.get_all_teachers()
-    page = layout.replace('CONTENT_BLOCK', principal_content)
-    return render_template_string(page, teachers=teachers)
+    return render_template('principal.html', teachers=teachers)
 
 @app.route('/principal/add', methods=['GET', 'POST'])
 def add_teacher():
@@ -570,14 +859,12 @@ def add_teacher():
         password = request.form['password'].strip()
         if not (username and password):
             flash('All fields are required.', 'err')
-            page = layout.replace('CONTENT_BLOCK', add_teacher_content)
-            return render_template_string(page)
+            return render_template('add_teacher.html')
         success, msg = teacher_manager.add_teacher(username, password)
         flash(msg, 'msg' if success else 'err')
         if success:
             return redirect(url_for('principal_dashboard'))
-    page = layout.replace('CONTENT_BLOCK', add_teacher_content)
-    return render_template_string(page)
+    return render_template('add_teacher.html')
 
 @app.route('/principal/edit/<username>', methods=['GET', 'POST'])
 def edit_teacher(username):
@@ -589,14 +876,12 @@ def edit_teacher(username):
         password = request.form['password'].strip()
         if not password:
             flash('Password is required.', 'err')
-            page = layout.replace('CONTENT_BLOCK', edit_teacher_content)
-            return render_template_string(page, teacher=teacher)
+            return render_template('edit_teacher.html', teacher=teacher)
         success, msg = teacher_manager.edit_teacher(username, password)
         flash(msg, 'msg' if success else 'err')
         if success:
             return redirect(url_for('principal_dashboard'))
-    page = layout.replace('CONTENT_BLOCK', edit_teacher_content)
-    return render_template_string(page, teacher=teacher)
+    return render_template('edit_teacher.html', teacher=teacher)
 
 @app.route('/principal/remove/<username>')
 def remove_teacher(username):
@@ -0,0 +1,34 @@
+import importlib.util
+import pathlib
+import shutil
+
+import pytest
+
+pytest.importorskip("flask")
+
+WEB_MODULE = pathlib.Path(__file__).parent.parent / "student_info_web.py"
+
+
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    # The module keeps its data files beside itself, so load a copy from tmp_path.
+    shutil.copy(WEB_MODULE, tmp_path)
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("student_info_web", tmp_path / WEB_MODULE.name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    module.flush_logs()
+
+
+def test_pages_autoescape_user_input(web):
+    client = web.app.test_client()
+    name = "<script>alert(1)</script>"
+    response = client.post(
+        "/add",
+        data={"name": name, "age": "12", "class": "x", "roll_number": "1"},
+        follow_redirects=True,
+    )
+    for body in (response.get_data(as_text=True), client.get("/logs").get_data(as_text=True)):
+        assert name not in body
+        assert "&lt;script&gt;" in body